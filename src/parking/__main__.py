@@ -1,32 +1,228 @@
-from typing import List, Tuple, Literal
-from copy import deepcopy
+import random
+from collections import deque
+from typing import Dict, List, Literal, Optional, Tuple
+
+# Cell codes stored on the board, one unsigned byte per cell.
+EMPTY = 0
+HORIZONTAL = 1
+VERTICAL = 2
 
 # The initial state of the game board.
-# 'h' denotes a horizontal car part, 'v' a vertical one, and 0 is empty.
+# HORIZONTAL denotes a horizontal car part, VERTICAL a vertical one.
 ESTADO_INICIAL = [
     [0, 0, 0, 0, 0],
-    [0, 0, "v", 0, 0],
-    [0, 0, "v", 0, 0],
+    [0, 0, VERTICAL, 0, 0],
+    [0, 0, VERTICAL, 0, 0],
     [0, 0, 0, 0, 0],
-    [0, 0, 0, "h", "h"],
+    [0, 0, 0, HORIZONTAL, HORIZONTAL],
 ]
 
 # The target state for the game to be won.
 ESTADO_OBJETIVO = [
     [0, 0, 0, 0, 0],
     [0, 0, 0, 0, 0],
-    [0, 0, 0, "h", "h"],
+    [0, 0, 0, HORIZONTAL, HORIZONTAL],
     [0, 0, 0, 0, 0],
     [0, 0, 0, 0, 0],
 ]
 
+# Bitboard layout: cell (r, c) maps to bit r * BOARD_DIMENSION + c, so the
+# whole 5x5 board fits in 25 bits and each car is a single int mask.
+BOARD_DIMENSION = 5
+ROW = [
+    ((1 << BOARD_DIMENSION) - 1) << (BOARD_DIMENSION * i)
+    for i in range(BOARD_DIMENSION)
+]
+TOP_ROW = ROW[0]
+BOTTOM_ROW = ROW[-1]
+LEFT_COL = sum(1 << (BOARD_DIMENSION * i) for i in range(BOARD_DIMENSION))
+RIGHT_COL = LEFT_COL << (BOARD_DIMENSION - 1)
+
+# ESTADO_INICIAL flattened row by row with a stride of BOARD_DIMENSION + 1,
+# so a power-of-two dimension never gives a power-of-two stride. The extra
+# column and the extra row at the end are EMPTY padding that closes runs in
+# Game.find_cars.
+ESTADO_INICIAL_FLAT = bytes(
+    [cell for row in ESTADO_INICIAL for cell in row + [EMPTY]]
+    + [EMPTY] * (BOARD_DIMENSION + 1)
+)
+
+
+def cell_bit(r: int, c: int) -> int:
+    """Returns the bitboard bit for the cell at row r, column c."""
+    return 1 << (r * BOARD_DIMENSION + c)
+
+
+def iter_bits(mask: int):
+    """Yields the index of every set bit in mask, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def iter_cells(mask: int):
+    """Yields the (row, col) of every cell set in a bitboard mask."""
+    for bit in iter_bits(mask):
+        yield divmod(bit, BOARD_DIMENSION)
+
+
+# Row/column offset of a one-cell move in each direction.
+DELTAS = {"up": (-1, 0), "down": (1, 0), "left": (0, -1), "right": (0, 1)}
+
+
+# The edge a car must not touch to move in each direction, and the bit
+# shift that moves a mask one cell that way (negative values are applied
+# as a right bit-shift).
+WALL = {"up": TOP_ROW, "down": BOTTOM_ROW, "left": LEFT_COL, "right": RIGHT_COL}
+SHIFT = {"up": -BOARD_DIMENSION, "down": BOARD_DIMENSION, "left": -1, "right": 1}
+
+
+def step_mask(mask: int, direction: str) -> int:
+    """Returns a mask moved one cell in the given direction, unchecked."""
+    shift = SHIFT[direction]
+    return mask << shift if shift > 0 else mask >> -shift
+
+
+def shift_mask(mask: int, occ: int, direction: str) -> int:
+    """
+    Returns a car mask moved one cell in the given direction, or 0 if the
+    car would leave the board or run into a cell of occ it doesn't own.
+    """
+    new_mask = step_mask(mask, direction)
+    # A single test covers both the wall and every cell held by other cars;
+    # a shift that wraps or leaves the board always touches the wall.
+    if (new_mask & (occ ^ mask)) | (mask & WALL[direction]):
+        return 0
+    return new_mask
+
+
+# Bit i of a legal-move mask stands for a move in DIRECTIONS[i].
+DIRECTIONS = tuple(DELTAS)
+
+
+def legal_directions(mask: int, occ: int) -> int:
+    """Returns the 4-bit mask of directions a car can currently move in."""
+    legal = 0
+    for bit, direction in enumerate(DIRECTIONS):
+        if shift_mask(mask, occ, direction):
+            legal |= 1 << bit
+    return legal
+
+
+# Zobrist keys: one random 64-bit value per (car index, cell). A state's
+# hash is the XOR of the keys of every cell each car covers, so a move only
+# XORs out the cells it leaves and XORs in the cells it enters. Seeded so
+# hashes are stable across runs.
+_zobrist_rng = random.Random(0)
+ZOBRIST = [
+    [_zobrist_rng.getrandbits(64) for _ in range(BOARD_DIMENSION * BOARD_DIMENSION)]
+    for _ in range(BOARD_DIMENSION * BOARD_DIMENSION)
+]
+
+
+def zobrist_delta(car_idx: int, cells: int) -> int:
+    """Returns the XOR of the Zobrist keys of car_idx over a cell mask."""
+    keys = ZOBRIST[car_idx]
+    h = 0
+    for bit in iter_bits(cells):
+        h ^= keys[bit]
+    return h
+
+
+def zobrist_hash(state: Tuple[int, ...]) -> int:
+    """Returns the Zobrist hash of a state given as a tuple of car masks."""
+    h = 0
+    for car_idx, mask in enumerate(state):
+        h ^= zobrist_delta(car_idx, mask)
+    return h
+
+
+# The cells the goal car has to cover for the game to be won.
+GOAL_MASK = sum(
+    cell_bit(r, c)
+    for r, row in enumerate(ESTADO_OBJETIVO)
+    for c, item in enumerate(row)
+    if item != EMPTY
+)
+
+# The shape of the car drawn in ESTADO_OBJETIVO. The goal car is the first
+# car, in reading order, with the same orientation and length.
+GOAL_ORIENTATION = (
+    "horizontal"
+    if HORIZONTAL in (item for row in ESTADO_OBJETIVO for item in row)
+    else "vertical"
+)
+GOAL_LENGTH = bin(GOAL_MASK).count("1")
+
+
+def search(
+    start: Tuple[int, ...], goal_car: Optional[int]
+) -> Optional[List[Tuple[int, str]]]:
+    """
+    Breadth-first search from a state given as a tuple of car masks.
+    Works on plain ints only, so it doesn't need a Game instance.
+    Returns the shortest list of (car_idx, direction) moves that puts the
+    goal car on GOAL_MASK, or None if it can't be reached.
+    """
+    if goal_car is None:
+        return None
+
+    start_hash = zobrist_hash(start)
+    # Maps the Zobrist hash of every state reached to the (hash, move) it
+    # came from, which doubles as the transposition table that prunes
+    # revisited states.
+    parents: Dict[int, Optional[tuple]] = {start_hash: None}
+    start_occ = 0
+    for mask in start:
+        start_occ |= mask
+    # Each queue entry carries its occupancy and hash so neither is ever
+    # recomputed from scratch
+    queue = deque([(start, start_occ, start_hash)])
+
+    while queue:
+        state, occ, h = queue.popleft()
+        if state[goal_car] == GOAL_MASK:
+            moves = []
+            while parents[h] is not None:
+                h, car_idx, direction = parents[h]
+                moves.append((car_idx, direction))
+            moves.reverse()
+            return moves
+
+        for car_idx, mask in enumerate(state):
+            # Only the directions set in the car's legal mask are expanded
+            for bit in iter_bits(legal_directions(mask, occ)):
+                direction = DIRECTIONS[bit]
+                new_mask = step_mask(mask, direction)
+                successor_hash = h ^ zobrist_delta(car_idx, mask ^ new_mask)
+                if successor_hash in parents:
+                    continue
+                parents[successor_hash] = (h, car_idx, direction)
+                successor = state[:car_idx] + (new_mask,) + state[car_idx + 1 :]
+                queue.append((successor, occ ^ mask ^ new_mask, successor_hash))
+
+    return None
+
+
+class IllegalMove(ValueError):
+    """Raised when a car can't be moved in the requested direction."""
+
+
+# Flyweight pool of Car instances keyed by (start_pos, end_pos, orientation),
+# so every distinct car placement exists only once in memory.
+_CAR_POOL: Dict[tuple, "Car"] = {}
+
 
 class Car:
     """
     Represents a single car on the game board.
     It stores the car's start and end coordinates and its orientation.
+    Cars are shared through Car.get, so they must not be modified in place.
     """
 
+    __slots__ = ("start_pos", "end_pos", "orientation", "length", "_is_horizontal")
+
     def __init__(
         self,
         start_pos: Tuple[int, int],
@@ -36,15 +232,48 @@ class Car:
         self.start_pos = start_pos
         self.end_pos = end_pos
         self.orientation = orientation
+        self._is_horizontal = orientation == "horizontal"
         self.length = self._calculate_length()
 
     def _calculate_length(self) -> int:
         """Calculates the length of the car based on its coordinates."""
-        if self.orientation == "horizontal":
+        if self._is_horizontal:
             return self.end_pos[1] - self.start_pos[1] + 1
         else:
             return self.end_pos[0] - self.start_pos[0] + 1
 
+    def to_mask(self) -> int:
+        """Returns the bitboard mask of the cells covered by the car."""
+        if self._is_horizontal:
+            # `length` consecutive bits along the row
+            run = (1 << self.length) - 1
+        else:
+            # One bit per row, taken from the first `length` rows of a column
+            run = LEFT_COL & ((1 << (self.length * BOARD_DIMENSION)) - 1)
+        return run << (self.start_pos[0] * BOARD_DIMENSION + self.start_pos[1])
+
+    @classmethod
+    def get(
+        cls,
+        start_pos: Tuple[int, int],
+        end_pos: Tuple[int, int],
+        orientation: Literal["vertical", "horizontal"],
+    ) -> "Car":
+        """Returns the shared Car for this placement, creating it if needed."""
+        key = (start_pos, end_pos, orientation)
+        car = _CAR_POOL.get(key)
+        if car is None:
+            car = _CAR_POOL[key] = cls(start_pos, end_pos, orientation)
+        return car
+
+    def translate(self, dr: int, dc: int) -> "Car":
+        """Returns the shared Car shifted by dr rows and dc columns."""
+        return Car.get(
+            (self.start_pos[0] + dr, self.start_pos[1] + dc),
+            (self.end_pos[0] + dr, self.end_pos[1] + dc),
+            self.orientation,
+        )
+
     def __repr__(self):
         """Provides a developer-friendly representation of the Car object."""
         return (
@@ -58,174 +287,200 @@ class Game:
     Manages the game state, including the board and the list of cars.
     """
 
-    def __init__(self, board_dimension=5):
+    def __init__(self, board_dimension=BOARD_DIMENSION):
+        # The bitboard masks and ESTADO_INICIAL_FLAT are laid out for a
+        # single board size, so any other size would misread the board.
+        if board_dimension != BOARD_DIMENSION:
+            raise ValueError(
+                f"board_dimension must be {BOARD_DIMENSION}, got {board_dimension}"
+            )
         self.board_dimension = board_dimension
-        # Initialize the board with the starting state
-        self.board = ESTADO_INICIAL
+        # Initialize the board with a copy of the starting state: one flat
+        # buffer where cell (r, c) lives at r * self._stride + c
+        self.board = bytearray(ESTADO_INICIAL_FLAT)
+        self._stride = board_dimension + 1
         self.cars: List[Car] = []
+        # One bitboard mask per car, plus the union of all of them
+        self.masks: List[int] = []
+        self.occ = 0
+        # Index of the car that has to reach GOAL_MASK, or None if no car
+        # has the shape of the one in ESTADO_OBJETIVO
+        self.goal_car: Optional[int] = None
+        # Zobrist hash of the car masks, updated incrementally on each move
+        self.hash = 0
+        # Directions each car can move in, as legal_directions() bit masks.
+        # Computed on first use and dropped on every move.
+        self._legal_mask: Optional[List[int]] = None
+        # Scratch buffer __str__ renders the car numbers into
+        self._render = bytearray(board_dimension * board_dimension)
+        # The car layout is fixed, so the board is only parsed once
+        self.find_cars()
+
+    def clone(self) -> "Game":
+        """
+        Returns an independent copy of the game for branching a search.
+        Every attribute is carried over, including any a subclass adds; only
+        the flat board buffer and the lists a move mutates are copied. Car
+        objects are shared, since they are pooled and never modified, and
+        the cached legal masks are replaced rather than mutated.
+        """
+        cls = type(self)
+        game = cls.__new__(cls)
+        game.__dict__.update(self.__dict__)
+        game.board = self.board[:]
+        game.cars = self.cars[:]
+        game.masks = self.masks[:]
+        game._render = bytearray(len(self._render))
+        return game
 
     def __repr__(self):
         """Returns a string representation of the board for printing."""
 
-        out = ""
-        out += "Board State:\n"
-        for row in self.board:
-            for item in row:
-                out += f"{item} "
-            out += "\n"
-        out += "\n"
-        out += "Identified Cars:\n"
+        parts: List[str] = ["Board State:\n"]
+        dim = self.board_dimension
+        board = memoryview(self.board)
+        for r in range(dim):
+            row = board[r * self._stride : r * self._stride + dim]
+            parts.append("".join(f"{item} " for item in row) + "\n")
+        parts.append("\n")
+        parts.append("Identified Cars:\n")
         for car in self.cars:
-            out += f"{car}\n"
-        return out
+            parts.append(f"{car}\n")
+        return "".join(parts)
 
     def __str__(self):
-        self.find_cars()
-        board = deepcopy(self.board)
+        dim = self.board_dimension
+        render = self._render
+        render[:] = bytes(len(render))
         for n, car in enumerate(self.cars):
-            start_pos = car.start_pos
-            end_pos = car.end_pos
-            orientation = car.orientation
-
-            if orientation == "vertical":
-                start_i, j = start_pos
-                end_i = end_pos[0] + 1
-                for i in range(start_i, end_i):
-                    board[i][j] = n + 1
-                continue
-
-            if orientation == "horizontal":
-                i, start_j = start_pos
-                end_j = end_pos[1] + 1
-                for j in range(start_j, end_j):
-                    board[i][j] = n + 1
-                continue
-
-        out = ""
-        for row in board:
-            for col in row:
-                out += f"{col} "
-            out += "\n"
-        return out
+            start_i, start_j = car.start_pos
+            end_i, end_j = car.end_pos
+            for i in range(start_i, end_i + 1):
+                for j in range(start_j, end_j + 1):
+                    render[i * dim + j] = n + 1
+
+        return "".join(
+            "".join(f"{col} " for col in render[i * dim : (i + 1) * dim]) + "\n"
+            for i in range(dim)
+        )
 
     def find_cars(self):
         """
         Scans the board to identify all cars and populates the self.cars list.
-        This method uses a depth-first search (DFS) to find all connected
-        parts of each car.
+        Cars are straight runs of identical cells, so a single pass in
+        reading order finds the first cell of each car and follows the run
+        to its end, tracking the extent as it goes.
         """
         # Reset the list of cars before scanning
         self.cars = []
-        # Create a visited grid to keep track of processed car parts
-        visited = [
-            [False for _ in range(self.board_dimension)]
-            for _ in range(self.board_dimension)
-        ]
-
-        # Iterate over every cell in the board
-        for r in range(self.board_dimension):
-            for c in range(self.board_dimension):
-                # If a cell contains a car part and hasn't been visited,
-                # it's the start of a new car to identify.
-                if self.board[r][c] != 0 and not visited[r][c]:
-                    car_type = self.board[r][c]
-                    orientation = "horizontal" if car_type == "h" else "vertical"
-
-                    # This list will store all coordinates of the current car
-                    car_parts = []
-                    # The stack for our iterative DFS
-                    stack = [(r, c)]
-
-                    # Perform DFS to find all parts of this car
-                    while stack:
-                        curr_r, curr_c = stack.pop()
-
-                        # Boundary and type checks
-                        is_valid_row = 0 <= curr_r < self.board_dimension
-                        is_valid_col = 0 <= curr_c < self.board_dimension
-
-                        if not (is_valid_row and is_valid_col):
-                            continue
-
-                        # If already visited or not part of the same car, skip
-                        if (
-                            visited[curr_r][curr_c]
-                            or self.board[curr_r][curr_c] != car_type
-                        ):
-                            continue
-
-                        # Mark as visited and add to our list of parts
-                        visited[curr_r][curr_c] = True
-                        car_parts.append((curr_r, curr_c))
-
-                        # Explore neighbors based on orientation
-                        if orientation == "horizontal":
-                            stack.append((curr_r, curr_c + 1))  # Right
-                            stack.append((curr_r, curr_c - 1))  # Left
-                        else:  # Vertical
-                            stack.append((curr_r + 1, curr_c))  # Down
-                            stack.append((curr_r - 1, curr_c))  # Up
-
-                    # After finding all parts, create the Car object
-                    if car_parts:
-                        # Determine start (min row/col) and end (max row/col)
-                        start_pos = (
-                            min(p[0] for p in car_parts),
-                            min(p[1] for p in car_parts),
-                        )
-                        end_pos = (
-                            max(p[0] for p in car_parts),
-                            max(p[1] for p in car_parts),
-                        )
-
-                        new_car = Car(start_pos, end_pos, orientation)
-                        self.cars.append(new_car)
-
-    def _move_up(self, car_num):
-        car = self.cars[car_num - 1]
-        orientation = "v" if car.orientation == "vertical" else "h"
-
-        if orientation == "h":
-            i, start_j = car.start_pos
-            end_j = car.end_pos[1]
-
-            for j in range(start_j, end_j + 1):
-                self.board[i][j] = 0
-                self.board[i - 1][j] = orientation
-
-        if orientation == "v":
-            start_i, j = car.start_pos
-            end_i = car.end_pos[0]
-
-            for i in range(start_i, end_i + 1):
-                self.board[i][j] = 0
-            for i in range(start_i, end_i + 1):
-                self.board[i - 1][j] = orientation
-
-    def _move_down(self, car_num):
-        car = self.cars[car_num - 1]
-        orientation = "v" if car.orientation == "vertical" else "h"
-        print(car)
-
-        if orientation == "h":
-            start_i, start_j = car.start_pos
-            end_i, end_j = start_i + 1, car.end_pos[1]
-
-            for j in range(start_j, end_j + 1):
-                self.board[start_i][j] = 0
-                self.board[end_i][j] = orientation
+        dim = self.board_dimension
+        stride = self._stride
+        board = self.board
+
+        for r in range(dim):
+            for c in range(dim):
+                i = r * stride + c
+                cell = board[i]
+                # A run starts where the cell before it differs. Looking one
+                # cell left or one row up from the edge lands on the padding
+                # column or, through a negative index, the padding row.
+                if cell == HORIZONTAL and board[i - 1] != HORIZONTAL:
+                    end = i
+                    while board[end + 1] == HORIZONTAL:
+                        end += 1
+                    self.cars.append(Car.get((r, c), (r, c + end - i), "horizontal"))
+                elif cell == VERTICAL and board[i - stride] != VERTICAL:
+                    end = i
+                    while board[end + stride] == VERTICAL:
+                        end += stride
+                    self.cars.append(
+                        Car.get((r, c), (r + (end - i) // stride, c), "vertical")
+                    )
+
+        self.goal_car = next(
+            (
+                car_idx
+                for car_idx, car in enumerate(self.cars)
+                if car.orientation == GOAL_ORIENTATION and car.length == GOAL_LENGTH
+            ),
+            None,
+        )
 
-        if orientation == "v":
-            start_i, j = car.start_pos
-            end_i = car.end_pos[0]
+        self.masks = [car.to_mask() for car in self.cars]
+        self.occ = 0
+        for mask in self.masks:
+            self.occ |= mask
+        self.hash = zobrist_hash(tuple(self.masks))
+        self._legal_mask = None
 
-            for i in range(start_i, end_i + 1):
-                self.board[i][j] = 0
-            for i in range(start_i, end_i + 1):
-                self.board[i + 1][j] = orientation
+    @property
+    def legal_mask(self) -> List[int]:
+        """
+        The legal_directions() bit mask of every car. Any move changes the
+        occupancy, which can free or block a neighbour, so the whole list is
+        rebuilt lazily the first time it's read after a move.
+        """
+        if self._legal_mask is None:
+            occ = self.occ
+            self._legal_mask = [legal_directions(mask, occ) for mask in self.masks]
+        return self._legal_mask
+
+    def legal_moves(self):
+        """Yields every (car_idx, direction) move allowed in this state."""
+        for car_idx, legal in enumerate(self.legal_mask):
+            for bit in iter_bits(legal):
+                yield car_idx, DIRECTIONS[bit]
+
+    def move(
+        self, car_idx: int, direction: Literal["up", "down", "left", "right"]
+    ):
+        """
+        Moves a car one cell in the given direction using its bitboard mask.
+        Raises IllegalMove, leaving the game untouched, if the car would
+        leave the board or run into another car.
+        """
+        # Negative indexes would pick the wrong Zobrist keys, so they're
+        # rejected along with indexes past the last car
+        if not 0 <= car_idx < len(self.masks):
+            raise IndexError(f"no car with index {car_idx}")
+
+        mask = self.masks[car_idx]
+        new_mask = shift_mask(mask, self.occ, direction)
+        if not new_mask:
+            raise IllegalMove(f"car {car_idx + 1} can't move {direction}")
+
+        car = self.cars[car_idx]
+        car_type = HORIZONTAL if car._is_horizontal else VERTICAL
+        stride = self._stride
+        for r, c in iter_cells(mask & ~new_mask):
+            self.board[r * stride + c] = EMPTY
+        for r, c in iter_cells(new_mask & ~mask):
+            self.board[r * stride + c] = car_type
+
+        self.occ ^= mask ^ new_mask
+        self.hash ^= zobrist_delta(car_idx, mask ^ new_mask)
+        self.masks[car_idx] = new_mask
+        self.cars[car_idx] = car.translate(*DELTAS[direction])
+        self._legal_mask = None
+
+    def is_solved(self) -> bool:
+        """Checks whether the goal car covers the cells of the target state."""
+        return self.goal_car is not None and self.masks[self.goal_car] == GOAL_MASK
+
+    def key(self) -> Tuple[int, ...]:
+        """
+        Returns a hashable key for the current state: the tuple of car masks.
+        The car layout never changes, so equal keys mean equal states.
+        """
+        return tuple(self.masks)
 
-    def move(self, car_idx: int, direction: Literal["up", "down", "left", "right"]):
-        pass
+    def solve(self) -> Optional[List[Tuple[int, str]]]:
+        """
+        Breadth-first search for the shortest list of (car_idx, direction)
+        moves that wins the game from the current state.
+        Returns None if the target state can't be reached.
+        """
+        return search(self.key(), self.goal_car)
 
 
 # --- Example Usage ---
@@ -233,13 +488,16 @@ if __name__ == "__main__":
     # 1. Create a new game instance.
     my_game = Game()
 
-    my_game.find_cars()
-
     # 4. Print the list of identified cars.
     print(my_game)
-    my_game._move_up(1)
-    my_game._move_up(2)
+    my_game.move(0, "up")
+    my_game.move(1, "up")
     print(my_game)
-    my_game._move_down(1)
-    my_game._move_down(2)
+    my_game.move(0, "down")
+    my_game.move(1, "down")
+    print(my_game)
+
+    # 5. Solve the game and replay the moves found.
+    for car_idx, direction in my_game.solve():
+        my_game.move(car_idx, direction)
     print(my_game)
@@ -0,0 +1,242 @@
+import unittest
+
+from parking.__main__ import (
+    BOARD_DIMENSION,
+    GOAL_MASK,
+    HORIZONTAL,
+    VERTICAL,
+    Game,
+    IllegalMove,
+    cell_bit,
+    zobrist_hash,
+)
+
+
+def game_from(rows):
+    """Builds a Game whose board is replaced by the given 5x5 rows."""
+    game = Game()
+    game.board[:] = bytes(
+        [cell for row in rows for cell in row + [0]] + [0] * (BOARD_DIMENSION + 1)
+    )
+    game.find_cars()
+    return game
+
+
+def snapshot(game):
+    """Returns everything a move is allowed to change."""
+    return (
+        repr(game),
+        list(game.masks),
+        game.occ,
+        game.hash,
+    )
+
+
+class TestFindCars(unittest.TestCase):
+    def test_cars_at_the_edges(self):
+        # Cars touch the first and last row and column, share rows, and a
+        # horizontal run ends a row right before another one starts the next
+        h, v = HORIZONTAL, VERTICAL
+        game = game_from(
+            [
+                [v, h, h, h, h],
+                [v, 0, 0, 0, 0],
+                [0, 0, 0, h, h],
+                [h, h, v, 0, 0],
+                [0, 0, v, h, h],
+            ]
+        )
+        self.assertEqual(
+            [(car.start_pos, car.end_pos, car.orientation) for car in game.cars],
+            [
+                ((0, 0), (1, 0), "vertical"),
+                ((0, 1), (0, 4), "horizontal"),
+                ((2, 3), (2, 4), "horizontal"),
+                ((3, 0), (3, 1), "horizontal"),
+                ((3, 2), (4, 2), "vertical"),
+                ((4, 3), (4, 4), "horizontal"),
+            ],
+        )
+        self.assertEqual(
+            game.masks,
+            [
+                cell_bit(0, 0) | cell_bit(1, 0),
+                cell_bit(0, 1) | cell_bit(0, 2) | cell_bit(0, 3) | cell_bit(0, 4),
+                cell_bit(2, 3) | cell_bit(2, 4),
+                cell_bit(3, 0) | cell_bit(3, 1),
+                cell_bit(3, 2) | cell_bit(4, 2),
+                cell_bit(4, 3) | cell_bit(4, 4),
+            ],
+        )
+
+
+class TestStr(unittest.TestCase):
+    def test_initial_state(self):
+        self.assertEqual(
+            str(Game()),
+            "0 0 0 0 0 \n"
+            "0 0 1 0 0 \n"
+            "0 0 1 0 0 \n"
+            "0 0 0 0 0 \n"
+            "0 0 0 2 2 \n",
+        )
+
+    def test_render_follows_moves(self):
+        game = Game()
+        str(game)
+        game.move(1, "up")
+        # The render buffer is reused, so the old cells must be cleared
+        self.assertEqual(
+            str(game),
+            "0 0 0 0 0 \n"
+            "0 0 1 0 0 \n"
+            "0 0 1 0 0 \n"
+            "0 0 0 2 2 \n"
+            "0 0 0 0 0 \n",
+        )
+
+
+class TestSolve(unittest.TestCase):
+    def test_initial_state(self):
+        self.assertEqual(Game().solve(), [(1, "up"), (1, "up")])
+
+    def test_blocked_board(self):
+        # Every cell is taken, so the goal car can never leave the bottom row
+        h, v = HORIZONTAL, VERTICAL
+        game = game_from(
+            [
+                [h, h, h, h, h],
+                [h, h, h, h, h],
+                [h, h, h, h, h],
+                [h, h, h, h, h],
+                [v, v, v, h, h],
+            ]
+        )
+        self.assertIsNone(game.solve())
+
+    def test_only_goal_car_wins(self):
+        # The first two-cell horizontal car is the goal car; the second one
+        # already sits on the goal cells but doesn't count
+        h = HORIZONTAL
+        game = game_from(
+            [
+                [h, h, 0, 0, 0],
+                [0, 0, 0, 0, 0],
+                [0, 0, 0, h, h],
+                [0, 0, 0, 0, 0],
+                [0, 0, 0, 0, 0],
+            ]
+        )
+        self.assertEqual(game.goal_car, 0)
+        self.assertFalse(game.is_solved())
+
+        moves = game.solve()
+        self.assertIsNotNone(moves)
+        for car_idx, direction in moves:
+            game.move(car_idx, direction)
+        self.assertTrue(game.is_solved())
+        self.assertEqual(game.masks[0], GOAL_MASK)
+
+
+class TestMove(unittest.TestCase):
+    def test_wall(self):
+        game = Game()
+        before = snapshot(game)
+        with self.assertRaises(IllegalMove):
+            game.move(1, "down")
+        self.assertEqual(snapshot(game), before)
+
+    def test_collision(self):
+        game = Game()
+        game.move(1, "up")
+        game.move(1, "left")
+        before = snapshot(game)
+        with self.assertRaises(IllegalMove):
+            game.move(0, "down")
+        self.assertEqual(snapshot(game), before)
+
+    def test_car_index_out_of_range(self):
+        game = Game()
+        before = snapshot(game)
+        for car_idx in (-1, len(game.cars)):
+            with self.assertRaises(IndexError):
+                game.move(car_idx, "up")
+        self.assertEqual(snapshot(game), before)
+        self.assertEqual(game.hash, zobrist_hash(game.key()))
+
+    def test_legal_moves(self):
+        game = Game()
+        self.assertEqual(
+            list(game.legal_moves()),
+            [
+                (0, "up"),
+                (0, "down"),
+                (0, "left"),
+                (0, "right"),
+                (1, "up"),
+                (1, "left"),
+            ],
+        )
+        cached = game.legal_mask
+
+        game.move(1, "up")
+        # The move drops the cached masks; they're rebuilt on the next read
+        self.assertIsNone(game._legal_mask)
+        self.assertEqual(
+            list(game.legal_moves()),
+            [
+                (0, "up"),
+                (0, "down"),
+                (0, "left"),
+                (0, "right"),
+                (1, "up"),
+                (1, "down"),
+                (1, "left"),
+            ],
+        )
+        self.assertIsNot(game.legal_mask, cached)
+
+    def test_hash_tracks_moves(self):
+        game = Game()
+        for car_idx, direction in [
+            (0, "up"),
+            (1, "left"),
+            (1, "up"),
+            (0, "right"),
+            (1, "left"),
+            (0, "down"),
+        ]:
+            game.move(car_idx, direction)
+            self.assertEqual(game.hash, zobrist_hash(game.key()))
+
+
+class TestClone(unittest.TestCase):
+    def test_clone_is_independent(self):
+        game = Game()
+        before = snapshot(game)
+        clone = game.clone()
+        clone.move(1, "up")
+        clone.move(0, "left")
+
+        self.assertEqual(snapshot(game), before)
+        self.assertNotEqual(snapshot(clone), before)
+        self.assertEqual(clone.hash, zobrist_hash(clone.key()))
+
+    def test_clone_keeps_subclass(self):
+        class MyGame(Game):
+            def __init__(self):
+                super().__init__()
+                self.history = []
+
+        game = MyGame()
+        game.history.append("start")
+        clone = game.clone()
+
+        self.assertIs(type(clone), MyGame)
+        self.assertEqual(clone.history, ["start"])
+        clone.move(1, "up")
+        self.assertNotEqual(game.masks, clone.masks)
+
+
+if __name__ == "__main__":
+    unittest.main()